@@ -6,20 +6,91 @@ Usage:   ./system_health_check.py [OPTIONS]
 Exit:    0 OK, 1 WARNING, 2 CRITICAL
 
 Dependencies: None (uses Python standard library only)
+Optional:     orjson (faster --json output)
+              dasbus (query systemd over D-Bus instead of running systemctl)
 """
 
 import sys
 import os
+import re
 import time
 import json
 import argparse
 import subprocess
 import platform
 import socket
-from pathlib import Path
+import threading
+import functools
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from dasbus.connection import SystemMessageBus
+    from dasbus.error import DBusError
+    from gi.repository.GLib import Error as GLibError
+except ImportError:
+    SystemMessageBus = None
+
+# Seconds to use systemctl after a D-Bus failure before trying D-Bus again
+_DBUS_RETRY_SECONDS = 60
+
+_MIB = 1 << 20
+_GIB = 1 << 30
+
+# Only these /proc/meminfo fields are used; values are in kB
+_MEMINFO_KEYS = (b'MemTotal', b'MemFree', b'MemAvailable', b'SwapTotal', b'SwapFree')
+_MEMINFO_RE = re.compile(
+    rb'^(' + b'|'.join(_MEMINFO_KEYS) + rb'):\s+(\d+)', re.MULTILINE
+)
+
+_PROCS_BLOCKED_RE = re.compile(rb'^procs_blocked (\d+)', re.MULTILINE)
+
+# /proc files kept open by the checker and re-read with pread()
+_PERSISTENT_PROC_FILES = ('stat', 'meminfo', 'loadavg', 'uptime')
+
+# Real filesystems worth reporting (virtual filesystems are skipped)
+_REAL_FS_TYPES = (b'ext4', b'ext3', b'ext2', b'xfs', b'btrfs', b'zfs', b'ntfs', b'vfat')
+_MOUNT_RE = re.compile(
+    rb'^(\S+) (\S+) (' + b'|'.join(_REAL_FS_TYPES) + rb') ', re.MULTILINE
+)
+
+
+def _slurp(path: str, size: int = 64) -> Optional[bytes]:
+    """Read a small procfs/sysfs file with a single read() call."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return os.read(fd, size)
+        finally:
+            os.close(fd)
+    except OSError:
+        return None
+
+
+def _read_file(path: str) -> Optional[str]:
+    """Read a small file and return its content as string."""
+    data = _slurp(path)
+    return data.decode('ascii', 'replace').strip() if data is not None else None
+
+
+@functools.lru_cache(maxsize=None)
+def _platform_info() -> Dict[str, str]:
+    """Collect platform information; it cannot change while running."""
+    return {
+        'system': platform.system(),
+        'release': platform.release(),
+        'version': platform.version(),
+        'machine': platform.machine(),
+        'python_version': platform.python_version()
+    }
 
 
 class SystemHealthChecker:
@@ -28,32 +99,104 @@ class SystemHealthChecker:
     def __init__(
         self,
         warning_thresholds: Dict[str, int],
-        critical_thresholds: Dict[str, int]
+        critical_thresholds: Dict[str, int],
+        scan_processes: bool = False
     ):
         self.warning_thresholds = warning_thresholds
         self.critical_thresholds = critical_thresholds
+        # Walk /proc/<pid>/stat for per-state counts (needed for zombies);
+        # otherwise only the kernel's task counters are read
+        self.scan_processes = scan_processes
         self.issues = []
         self.warnings = []
+        # Issues and warnings raised by the check running in the current thread
+        self._findings = threading.local()
+        # Frequently read /proc files stay open between checks; pread() at
+        # offset 0 makes the kernel regenerate their content
+        self._proc_fds: Dict[str, int] = {}
+        for name in _PERSISTENT_PROC_FILES:
+            try:
+                self._proc_fds[name] = os.open(f'/proc/{name}', os.O_RDONLY)
+            except OSError:
+                pass
+        # The previous (total, idle) sample lets repeated checks skip the
+        # sampling sleep
+        self._prev_cpu_stats: Optional[Tuple[int, int]] = None
+        self._prev_cpu_time = 0.0
+        # systemd D-Bus proxy, created on first use and dropped on failure
+        self._systemd = None
+        self._dbus_retry_at = 0.0
+        # Processor count does not change at runtime, so look it up once
+        self._cpu_count = os.cpu_count()
+
+    def __enter__(self) -> 'SystemHealthChecker':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close file descriptors kept open between checks."""
+        for fd in self._proc_fds.values():
+            os.close(fd)
+        self._proc_fds.clear()
+
+    def _read_proc(self, name: str, size: int = 0) -> bytes:
+        """Read /proc/<name> via its persistent fd (size=0 reads it all)."""
+        fd = self._proc_fds.get(name)
+        if fd is None:
+            raise FileNotFoundError(f'/proc/{name} is not available')
+        if size:
+            return os.pread(fd, size, 0)
+
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, 65536, offset)
+            if not chunk:
+                return b''.join(chunks)
+            chunks.append(chunk)
+            offset += len(chunk)
 
     def check_health(self) -> Dict[str, Any]:
         """Run all health checks and return results."""
-        results = {
-            'timestamp': datetime.now().isoformat(),
-            'hostname': socket.gethostname(),
-            'platform': self._get_platform_info(),
-            'uptime': self._get_uptime(),
-            'cpu': self._check_cpu(),
-            'memory': self._check_memory(),
-            'disk': self._check_disk(),
-            'load': self._check_load_average(),
-            'services': self._check_services(),
-            'processes': self._check_processes(),
-            'network': self._check_network(),
-            'status': 'OK',
-            'issues': self.issues,
-            'warnings': self.warnings
+        checks = {
+            'cpu': self._check_cpu,
+            'memory': self._check_memory,
+            'disk': self._check_disk,
+            'load': self._check_load_average,
+            'services': self._check_services,
+            'processes': self._check_processes,
+            'network': self._check_network
         }
 
+        # Checks are independent and mostly wait on I/O, sleeps or
+        # subprocesses, so run them concurrently
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {
+                name: pool.submit(self._run_check, check)
+                for name, check in checks.items()
+            }
+
+            results = {
+                'timestamp': datetime.now().isoformat(),
+                'hostname': socket.gethostname(),
+                'platform': self._get_platform_info(),
+                'uptime': self._get_uptime()
+            }
+
+        # Merge in a fixed order so the report does not depend on timing
+        self.issues = []
+        self.warnings = []
+        for name, future in futures.items():
+            results[name], issues, warnings = future.result()
+            self.issues.extend(issues)
+            self.warnings.extend(warnings)
+
+        results['status'] = 'OK'
+        results['issues'] = self.issues
+        results['warnings'] = self.warnings
+
         # Determine overall status
         if self.issues:
             results['status'] = 'CRITICAL'
@@ -62,26 +205,38 @@ class SystemHealthChecker:
 
         return results
 
+    def _run_check(
+        self,
+        check: Callable[[], Any]
+    ) -> Tuple[Any, List[str], List[str]]:
+        """Run one check, returning (result, issues, warnings)."""
+        self._findings.issues = []
+        self._findings.warnings = []
+        result = check()
+        return result, self._findings.issues, self._findings.warnings
+
+    def _add_issue(self, message: str) -> None:
+        """Record a critical issue found by the current check."""
+        self._findings.issues.append(message)
+
+    def _add_warning(self, message: str) -> None:
+        """Record a warning found by the current check."""
+        self._findings.warnings.append(message)
+
     def _get_platform_info(self) -> Dict[str, str]:
         """Get platform information."""
-        return {
-            'system': platform.system(),
-            'release': platform.release(),
-            'version': platform.version(),
-            'machine': platform.machine(),
-            'python_version': platform.python_version()
-        }
+        # Copy so callers cannot modify the cached values
+        return dict(_platform_info())
 
     def _get_uptime(self) -> Optional[str]:
         """Get system uptime."""
         try:
-            with open('/proc/uptime', 'r', encoding='utf-8') as f:
-                uptime_seconds = float(f.read().split()[0])
-                days = int(uptime_seconds // 86400)
-                hours = int((uptime_seconds % 86400) // 3600)
-                minutes = int((uptime_seconds % 3600) // 60)
-                return f"{days}d {hours}h {minutes}m"
-        except (FileNotFoundError, PermissionError, ValueError):
+            uptime_seconds = float(self._read_proc('uptime', 64).split()[0])
+            days = int(uptime_seconds // 86400)
+            hours = int((uptime_seconds % 86400) // 3600)
+            minutes = int((uptime_seconds % 3600) // 60)
+            return f"{days}d {hours}h {minutes}m"
+        except (OSError, ValueError, IndexError):
             return None
 
     def _check_cpu(self) -> Dict[str, Any]:
@@ -93,10 +248,7 @@ class SystemHealthChecker:
         }
 
         try:
-            # Get CPU count
-            with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
-                cpu_count = sum(1 for line in f if line.startswith('processor'))
-                cpu_info['cores'] = cpu_count
+            cpu_info['cores'] = self._cpu_count
 
             # Get CPU usage from /proc/stat
             usage = self._get_cpu_usage()
@@ -105,13 +257,13 @@ class SystemHealthChecker:
 
                 if usage >= self.critical_thresholds['cpu']:
                     cpu_info['status'] = 'CRITICAL'
-                    self.issues.append(
+                    self._add_issue(
                         f"CPU usage at {usage:.1f}% "
                         f"(critical threshold: {self.critical_thresholds['cpu']}%)"
                     )
                 elif usage >= self.warning_thresholds['cpu']:
                     cpu_info['status'] = 'WARNING'
-                    self.warnings.append(
+                    self._add_warning(
                         f"CPU usage at {usage:.1f}% "
                         f"(warning threshold: {self.warning_thresholds['cpu']}%)"
                     )
@@ -121,25 +273,30 @@ class SystemHealthChecker:
 
         return cpu_info
 
+    def _read_cpu_sample(self) -> Tuple[int, int]:
+        """Return (total, idle) jiffies from the aggregate line of /proc/stat."""
+        data = self._read_proc('stat', 256)
+        stats = [int(x) for x in data.split(b'\n', 1)[0].split()[1:]]
+        return sum(stats), stats[3]
+
     def _get_cpu_usage(self) -> Optional[float]:
-        """Calculate CPU usage percentage."""
+        """Calculate CPU usage percentage since the previous sample."""
         try:
-            # Read /proc/stat twice with a small delay
-            with open('/proc/stat', 'r', encoding='utf-8') as f:
-                line1 = f.readline()
-            time.sleep(0.1)
-            with open('/proc/stat', 'r', encoding='utf-8') as f:
-                line2 = f.readline()
-
-            # Parse CPU stats
-            stats1 = [int(x) for x in line1.split()[1:]]
-            stats2 = [int(x) for x in line2.split()[1:]]
-
-            # Calculate differences
-            idle1 = stats1[3]
-            idle2 = stats2[3]
-            total1 = sum(stats1)
-            total2 = sum(stats2)
+            if self._prev_cpu_stats is None:
+                # First call: take a warm-up sample
+                self._prev_cpu_stats = self._read_cpu_sample()
+                self._prev_cpu_time = time.monotonic()
+
+            # Sample over at least 100ms; only the first (or a rapidly
+            # repeated) check actually has to wait
+            elapsed = time.monotonic() - self._prev_cpu_time
+            if elapsed < 0.1:
+                time.sleep(0.1 - elapsed)
+
+            total1, idle1 = self._prev_cpu_stats
+            total2, idle2 = self._read_cpu_sample()
+            self._prev_cpu_stats = (total2, idle2)
+            self._prev_cpu_time = time.monotonic()
 
             total_diff = total2 - total1
             idle_diff = idle2 - idle1
@@ -150,7 +307,7 @@ class SystemHealthChecker:
             usage = 100.0 * (total_diff - idle_diff) / total_diff
             return usage
 
-        except (FileNotFoundError, PermissionError, ValueError, IndexError):
+        except (OSError, ValueError, IndexError):
             return None
 
     def _check_memory(self) -> Dict[str, Any]:
@@ -168,14 +325,14 @@ class SystemHealthChecker:
         }
 
         try:
-            with open('/proc/meminfo', 'r', encoding='utf-8') as f:
-                meminfo = {}
-                for line in f:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        key = parts[0].rstrip(':')
-                        value = int(parts[1])
-                        meminfo[key] = value
+            data = self._read_proc('meminfo')
+
+            # Pick out the wanted fields and stop once all have been seen
+            meminfo = {}
+            for match in _MEMINFO_RE.finditer(data):
+                meminfo[match.group(1).decode('ascii')] = int(match.group(2))
+                if len(meminfo) == len(_MEMINFO_KEYS):
+                    break
 
             # Convert kB to MB
             mem_info['total_mb'] = meminfo.get('MemTotal', 0) // 1024
@@ -190,13 +347,13 @@ class SystemHealthChecker:
 
                 if mem_info['usage_percent'] >= self.critical_thresholds['memory']:
                     mem_info['status'] = 'CRITICAL'
-                    self.issues.append(
+                    self._add_issue(
                         f"Memory usage at {mem_info['usage_percent']:.1f}% "
                         f"(critical threshold: {self.critical_thresholds['memory']}%)"
                     )
                 elif mem_info['usage_percent'] >= self.warning_thresholds['memory']:
                     mem_info['status'] = 'WARNING'
-                    self.warnings.append(
+                    self._add_warning(
                         f"Memory usage at {mem_info['usage_percent']:.1f}% "
                         f"(warning threshold: {self.warning_thresholds['memory']}%)"
                     )
@@ -212,9 +369,9 @@ class SystemHealthChecker:
             if swap_total > 0:
                 mem_info['swap_percent'] = round(100.0 * swap_used / swap_total, 2)
                 if mem_info['swap_percent'] >= 50:
-                    self.warnings.append(f"Swap usage at {mem_info['swap_percent']:.1f}%")
+                    self._add_warning(f"Swap usage at {mem_info['swap_percent']:.1f}%")
 
-        except (FileNotFoundError, PermissionError, ValueError):
+        except (OSError, ValueError):
             mem_info['status'] = 'UNKNOWN'
 
         return mem_info
@@ -225,77 +382,72 @@ class SystemHealthChecker:
 
         try:
             # Read /proc/mounts to get mounted filesystems
-            with open('/proc/mounts', 'r', encoding='utf-8') as f:
-                mounts = [line.split() for line in f if line.strip()]
-
-            # Filter to real filesystems (skip virtual filesystems)
-            real_fs_types = {
-                'ext4', 'ext3', 'ext2', 'xfs', 'btrfs', 'zfs', 'ntfs', 'vfat'
-            }
-
-            for mount in mounts:
-                if len(mount) < 3:
+            with open('/proc/mounts', 'rb') as f:
+                data = f.read()
+
+            # Bind mounts (common in containers) list the same filesystem
+            # several times; report each st_dev once, counting it as seen only
+            # after statvfs succeeds so an unreadable mount hides no others
+            seen_devs = set()
+            for match in _MOUNT_RE.finditer(data):
+                device, mountpoint, fstype = (
+                    field.decode('utf-8', 'replace') for field in match.groups()
+                )
+                try:
+                    st_dev = os.stat(mountpoint).st_dev
+                    if st_dev in seen_devs:
+                        continue
+                    vfs = os.statvfs(mountpoint)
+                except OSError:
                     continue
+                seen_devs.add(st_dev)
+
+                total = vfs.f_blocks * vfs.f_frsize
+                free = vfs.f_bfree * vfs.f_frsize
+                available = vfs.f_bavail * vfs.f_frsize
+                used = total - free
+
+                # Integer percentage for the threshold checks; thresholds are
+                # whole numbers, so flooring does not change the outcome
+                usage_pct_int = used * 100 // total if total > 0 else 0
+                usage_percent = round(100.0 * used / total, 2) if total > 0 else 0
+
+                disk_info = {
+                    'mountpoint': mountpoint,
+                    'device': device,
+                    'fstype': fstype,
+                    'total_bytes': total,
+                    'used_bytes': used,
+                    'free_bytes': free,
+                    'available_bytes': available,
+                    'total_gb': round(total / _GIB, 2),
+                    'used_gb': round(used / _GIB, 2),
+                    'free_gb': round(free / _GIB, 2),
+                    'available_gb': round(available / _GIB, 2),
+                    'usage_percent': usage_percent,
+                    'status': 'OK'
+                }
 
-                device, mountpoint, fstype = mount[0], mount[1], mount[2]
-
-                if fstype not in real_fs_types:
-                    continue
+                if usage_pct_int >= self.critical_thresholds['disk']:
+                    disk_info['status'] = 'CRITICAL'
+                    self._add_issue(
+                        f"Disk {mountpoint} at {usage_percent:.1f}% "
+                        f"(critical threshold: {self.critical_thresholds['disk']}%)"
+                    )
+                elif usage_pct_int >= self.warning_thresholds['disk']:
+                    disk_info['status'] = 'WARNING'
+                    self._add_warning(
+                        f"Disk {mountpoint} at {usage_percent:.1f}% "
+                        f"(warning threshold: {self.warning_thresholds['disk']}%)"
+                    )
 
-                disk_info = self._get_disk_usage(mountpoint)
-                if disk_info:
-                    disk_info['device'] = device
-                    disk_info['fstype'] = fstype
-                    disks.append(disk_info)
+                disks.append(disk_info)
 
         except (FileNotFoundError, PermissionError):
             pass
 
         return disks
 
-    def _get_disk_usage(self, path: str) -> Optional[Dict[str, Any]]:
-        """Get disk usage for a specific path."""
-        try:
-            # Use os.statvfs for proper disk stats
-            vfs = os.statvfs(path)
-
-            total = vfs.f_blocks * vfs.f_frsize
-            free = vfs.f_bfree * vfs.f_frsize
-            available = vfs.f_bavail * vfs.f_frsize
-            used = total - free
-
-            usage_percent = 0
-            if total > 0:
-                usage_percent = round(100.0 * used / total, 2)
-
-            disk_info = {
-                'mountpoint': path,
-                'total_gb': round(total / (1024**3), 2),
-                'used_gb': round(used / (1024**3), 2),
-                'free_gb': round(free / (1024**3), 2),
-                'available_gb': round(available / (1024**3), 2),
-                'usage_percent': usage_percent,
-                'status': 'OK'
-            }
-
-            if usage_percent >= self.critical_thresholds['disk']:
-                disk_info['status'] = 'CRITICAL'
-                self.issues.append(
-                    f"Disk {path} at {usage_percent:.1f}% "
-                    f"(critical threshold: {self.critical_thresholds['disk']}%)"
-                )
-            elif usage_percent >= self.warning_thresholds['disk']:
-                disk_info['status'] = 'WARNING'
-                self.warnings.append(
-                    f"Disk {path} at {usage_percent:.1f}% "
-                    f"(warning threshold: {self.warning_thresholds['disk']}%)"
-                )
-
-            return disk_info
-
-        except (FileNotFoundError, PermissionError, OSError):
-            return None
-
     def _check_load_average(self) -> Dict[str, Any]:
         """Check system load average."""
         load_info = {
@@ -308,36 +460,35 @@ class SystemHealthChecker:
         }
 
         try:
-            with open('/proc/loadavg', 'r', encoding='utf-8') as f:
-                loads = f.read().split()
-                load_info['load_1min'] = float(loads[0])
-                load_info['load_5min'] = float(loads[1])
-                load_info['load_15min'] = float(loads[2])
-
-            # Get CPU count for load per core
-            with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
-                cpu_count = sum(1 for line in f if line.startswith('processor'))
-                load_info['cpu_cores'] = cpu_count
-
-            if cpu_count > 0:
+            loads = self._read_proc('loadavg', 128).split()
+            load_info['load_1min'] = float(loads[0])
+            load_info['load_5min'] = float(loads[1])
+            load_info['load_15min'] = float(loads[2])
+
+            # /proc/loadavg is host-wide, so compare it against all host CPUs
+            # rather than the ones this process is pinned to
+            cpu_count = self._cpu_count
+            load_info['cpu_cores'] = cpu_count
+
+            if cpu_count:
                 load_per_core = load_info['load_1min'] / cpu_count
                 load_info['load_per_core'] = round(load_per_core, 2)
 
                 # Check if load is high
                 if load_per_core >= 2.0:
                     load_info['status'] = 'CRITICAL'
-                    self.issues.append(
+                    self._add_issue(
                         f"Load average {load_info['load_1min']} is high for "
                         f"{cpu_count} cores (load per core: {load_per_core:.2f})"
                     )
                 elif load_per_core >= 1.5:
                     load_info['status'] = 'WARNING'
-                    self.warnings.append(
+                    self._add_warning(
                         f"Load average {load_info['load_1min']} is elevated for "
                         f"{cpu_count} cores (load per core: {load_per_core:.2f})"
                     )
 
-        except (FileNotFoundError, PermissionError, ValueError, IndexError):
+        except (OSError, ValueError, IndexError):
             load_info['status'] = 'UNKNOWN'
 
         return load_info
@@ -353,36 +504,76 @@ class SystemHealthChecker:
 
         service_status = []
 
-        for service in services_to_check:
-            status = self._get_service_status(service)
+        for status in self._get_service_statuses(services_to_check):
+            service = status['name']
             if status['status'] != 'not_found':
                 service_status.append(status)
                 if status['status'] not in ['active', 'running']:
-                    self.warnings.append(f"Service {service} is {status['status']}")
+                    self._add_warning(f"Service {service} is {status['status']}")
 
         return service_status
 
-    def _get_service_status(self, service: str) -> Dict[str, str]:
-        """Get status of a specific service using systemctl."""
+    def _get_service_statuses(self, services: List[str]) -> List[Dict[str, str]]:
+        """Get status of several services via D-Bus or a single systemctl call."""
+        statuses = self._get_service_statuses_dbus(services)
+        if statuses is not None:
+            return statuses
+
         try:
+            # systemctl prints one state per unit, in the order given
             result = subprocess.run(
-                ['systemctl', 'is-active', service],
+                ['systemctl', 'is-active', *services],
                 capture_output=True,
                 text=True,
                 timeout=5,
                 check=False
             )
-            status = result.stdout.strip()
+            states = result.stdout.splitlines()
+        except (subprocess.TimeoutExpired, FileNotFoundError, PermissionError):
+            return [{'name': service, 'status': 'not_found'} for service in services]
 
-            return {
+        statuses = []
+        for i, service in enumerate(services):
+            status = states[i].strip() if i < len(states) else ''
+            statuses.append({
                 'name': service,
                 'status': status if status else 'unknown'
-            }
-        except (subprocess.TimeoutExpired, FileNotFoundError, PermissionError):
-            return {
-                'name': service,
-                'status': 'not_found'
-            }
+            })
+        return statuses
+
+    def _get_service_statuses_dbus(
+        self,
+        services: List[str]
+    ) -> Optional[List[Dict[str, str]]]:
+        """Get service states from systemd over D-Bus, or None if unavailable."""
+        if SystemMessageBus is None or time.monotonic() < self._dbus_retry_at:
+            return None
+
+        units = [s if '.' in s else f'{s}.service' for s in services]
+        try:
+            if self._systemd is None:
+                self._systemd = SystemMessageBus().get_proxy(
+                    'org.freedesktop.systemd1', '/org/freedesktop/systemd1'
+                )
+            # One call for all units. Replies come back in request order but
+            # carry the unit's primary name (sshd.service is reported as
+            # ssh.service on Debian), so pair them by position; field 3 is
+            # ActiveState
+            replies = self._systemd.ListUnitsByNames(units)
+        except (DBusError, GLibError):
+            # No system bus, no systemd or an old systemd: use systemctl for
+            # a while, then reconnect
+            self._systemd = None
+            self._dbus_retry_at = time.monotonic() + _DBUS_RETRY_SECONDS
+            return None
+
+        if len(replies) != len(services):
+            return None
+
+        return [
+            {'name': service, 'status': reply[3] or 'unknown'}
+            for service, reply in zip(services, replies)
+        ]
 
     def _check_processes(self) -> Dict[str, Any]:
         """Check process information."""
@@ -390,40 +581,75 @@ class SystemHealthChecker:
             'total': 0,
             'running': 0,
             'sleeping': 0,
+            'blocked': 0,
             'zombie': 0,
             'stopped': 0,
             'status': 'OK'
         }
 
+        if not self.scan_processes:
+            return self._read_process_counters(process_info)
+
         try:
-            proc_path = Path('/proc')
-            state_counts = defaultdict(int)
-
-            for item in proc_path.iterdir():
-                if item.is_dir() and item.name.isdigit():
-                    try:
-                        with open(item / 'stat', 'r', encoding='utf-8') as f:
-                            stat_line = f.read()
-                            # State is the third field (after PID and command)
-                            state = stat_line.split(')')[1].split()[0]
-                            state_counts[state] += 1
-                    except (FileNotFoundError, PermissionError):
+            # Histogram indexed by the state byte (R, S, D, Z, T, ...)
+            state_counts = array('I', [0]) * 256
+
+            # scandir gets names from getdents, so no per-entry stat is needed
+            with os.scandir('/proc') as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not '0' <= name[0] <= '9':
+                        continue
+
+                    stat_line = _slurp(f'/proc/{name}/stat', 512)
+                    if not stat_line:
                         continue
 
-            process_info['total'] = sum(state_counts.values())
-            process_info['running'] = state_counts.get('R', 0)
-            process_info['sleeping'] = state_counts.get('S', 0)
-            process_info['zombie'] = state_counts.get('Z', 0)
-            process_info['stopped'] = state_counts.get('T', 0)
+                    # State follows the command, which may itself contain ')'
+                    idx = stat_line.rfind(b')') + 2
+                    if idx < len(stat_line):
+                        state_counts[stat_line[idx]] += 1
+
+            process_info['total'] = sum(state_counts)
+            process_info['running'] = state_counts[ord('R')]
+            process_info['sleeping'] = state_counts[ord('S')]
+            process_info['blocked'] = state_counts[ord('D')]
+            process_info['zombie'] = state_counts[ord('Z')]
+            process_info['stopped'] = state_counts[ord('T')]
 
             if process_info['zombie'] > 0:
-                self.warnings.append(f"Found {process_info['zombie']} zombie process(es)")
+                self._add_warning(f"Found {process_info['zombie']} zombie process(es)")
 
         except (FileNotFoundError, PermissionError):
             process_info['status'] = 'UNKNOWN'
 
         return process_info
 
+    def _read_process_counters(self, process_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill process counts from kernel counters without a per-PID scan.
+
+        Counts come from /proc/loadavg and /proc/stat and cover all tasks
+        (threads included). Per-state counts other than running and blocked
+        are not available and are reported as None.
+        """
+        process_info['sleeping'] = None
+        process_info['zombie'] = None
+        process_info['stopped'] = None
+
+        try:
+            # Fourth field is "running/total"
+            running, total = self._read_proc('loadavg', 128).split()[3].split(b'/')
+            process_info['running'] = int(running)
+            process_info['total'] = int(total)
+
+            match = _PROCS_BLOCKED_RE.search(self._read_proc('stat'))
+            process_info['blocked'] = int(match.group(1)) if match else None
+
+        except (OSError, ValueError, IndexError):
+            process_info['status'] = 'UNKNOWN'
+
+        return process_info
+
     def _check_network(self) -> Dict[str, Any]:
         """Check network interface statistics."""
         network_info = {
@@ -432,49 +658,49 @@ class SystemHealthChecker:
         }
 
         try:
-            net_path = Path('/sys/class/net')
-            for iface in net_path.iterdir():
-                if iface.name == 'lo':
+            # One read gives the counters of every interface; columns are
+            # 8 receive fields (bytes, packets, errs, ...) then 8 transmit
+            with open('/proc/net/dev', 'rb') as f:
+                lines = f.read().splitlines()[2:]
+
+            for line in lines:
+                name, _, counters = line.partition(b':')
+                name = name.strip().decode('utf-8', 'replace')
+                if name == 'lo':
                     continue
+                fields = counters.split()
 
                 iface_info = {
-                    'name': iface.name,
-                    'state': self._read_file(iface / 'operstate'),
-                    'rx_bytes': self._read_int_file(iface / 'statistics' / 'rx_bytes'),
-                    'tx_bytes': self._read_int_file(iface / 'statistics' / 'tx_bytes'),
-                    'rx_errors': self._read_int_file(iface / 'statistics' / 'rx_errors'),
-                    'tx_errors': self._read_int_file(iface / 'statistics' / 'tx_errors')
+                    'name': name,
+                    'state': _read_file(f'/sys/class/net/{name}/operstate'),
+                    'rx_bytes': int(fields[0]),
+                    'tx_bytes': int(fields[8]),
+                    'rx_errors': int(fields[2]),
+                    'tx_errors': int(fields[10])
                 }
 
                 # Convert bytes to MB
                 if iface_info['rx_bytes']:
-                    iface_info['rx_mb'] = round(iface_info['rx_bytes'] / (1024**2), 2)
+                    iface_info['rx_mb'] = round(iface_info['rx_bytes'] / _MIB, 2)
                 if iface_info['tx_bytes']:
-                    iface_info['tx_mb'] = round(iface_info['tx_bytes'] / (1024**2), 2)
+                    iface_info['tx_mb'] = round(iface_info['tx_bytes'] / _MIB, 2)
 
                 network_info['interfaces'].append(iface_info)
 
                 if iface_info['state'] == 'down':
-                    self.warnings.append(f"Network interface {iface.name} is down")
+                    self._add_warning(f"Network interface {name} is down")
 
-        except (FileNotFoundError, PermissionError):
+        except (OSError, ValueError, IndexError):
             network_info['status'] = 'UNKNOWN'
 
         return network_info
 
-    def _read_file(self, path: Path) -> Optional[str]:
-        """Read a file and return its content as string."""
-        try:
-            return path.read_text(encoding='utf-8').strip()
-        except (FileNotFoundError, PermissionError):
-            return None
 
-    def _read_int_file(self, path: Path) -> Optional[int]:
-        """Read a file and return its content as integer."""
-        try:
-            return int(path.read_text(encoding='utf-8').strip())
-        except (FileNotFoundError, PermissionError, ValueError):
-            return None
+def format_json(results: Dict[str, Any]) -> str:
+    """Format results as indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(results, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(results, indent=2)
 
 
 def format_plain_text(results: Dict[str, Any]) -> str:
@@ -548,8 +774,13 @@ def format_plain_text(results: Dict[str, Any]) -> str:
     lines.append(f"Processes: {proc['status']}")
     lines.append(f"  Total:    {proc['total']}")
     lines.append(f"  Running:  {proc['running']}")
-    lines.append(f"  Sleeping: {proc['sleeping']}")
-    if proc['zombie'] > 0:
+    sleeping = proc['sleeping'] if proc['sleeping'] is not None else 'n/a'
+    lines.append(f"  Sleeping: {sleeping}")
+    if proc['blocked']:
+        lines.append(f"  Blocked:  {proc['blocked']}")
+    if proc['zombie'] is None:
+        lines.append("  Zombie:   n/a (use --deep-proc-scan)")
+    elif proc['zombie'] > 0:
         lines.append(f"  Zombie:   {proc['zombie']} ⚠")
     lines.append("")
 
@@ -596,6 +827,120 @@ def format_plain_text(results: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+# Latest results for --serve mode, serialized once so requests only copy bytes,
+# and the time.monotonic() of the refresh that produced them
+_results_lock = threading.Lock()
+_last_body: bytes = b'{}'
+_last_update: Optional[float] = None
+
+
+def _refresh_results(checker: SystemHealthChecker) -> None:
+    """Run the health check and publish the results to the HTTP handler."""
+    global _last_body, _last_update
+    try:
+        body = format_json(checker.check_health()).encode('utf-8')
+    except Exception as e:
+        # Keep serving (and refreshing); the handler reports stale results
+        print(f"Health check failed: {e!r}", file=sys.stderr)
+        return
+    with _results_lock:
+        _last_body = body
+        _last_update = time.monotonic()
+
+
+def _refresh_loop(
+    checker: SystemHealthChecker,
+    interval: float,
+    stop: threading.Event
+) -> None:
+    """Re-run the health check every interval seconds until stopped."""
+    while not stop.wait(interval):
+        _refresh_results(checker)
+
+
+class _ResultsHandler(BaseHTTPRequestHandler):
+    """Serve the cached results as JSON on /."""
+
+    def do_GET(self):
+        if self.path not in ('/', '/health'):
+            self.send_error(404)
+            return
+
+        with _results_lock:
+            body = _last_body
+            last_update = _last_update
+
+        # Results that stopped refreshing are still returned, but as 503 so
+        # pollers do not mistake them for a current report
+        if last_update is None:
+            age = None
+            stale = True
+        else:
+            age = time.monotonic() - last_update
+            stale = age > self.server.stale_after
+
+        self.send_response(503 if stale else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if age is not None:
+            self.send_header('Age', str(int(age)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        # Pollers hit this constantly; keep stderr quiet
+        pass
+
+
+def serve(
+    checker: SystemHealthChecker,
+    address: str,
+    port: int,
+    refresh_seconds: float
+) -> int:
+    """
+    Serve cached results over HTTP, refreshing them in the background.
+    Returns: Exit code (0 = stopped normally, 1 = could not listen)
+    """
+    try:
+        server = ThreadingHTTPServer((address, port), _ResultsHandler)
+    except OSError as e:
+        print(
+            f"Cannot listen on {address}:{port}: {e.strerror or e}",
+            file=sys.stderr
+        )
+        return 1
+    # Stale after three missed refreshes, allowing for slow checks
+    # (systemctl alone may take up to 5 seconds)
+    server.stale_after = 3 * refresh_seconds + 10
+
+    # Have results ready before the first request arrives
+    _refresh_results(checker)
+
+    stop = threading.Event()
+    refresher = threading.Thread(
+        target=_refresh_loop,
+        args=(checker, refresh_seconds, stop),
+        daemon=True
+    )
+    refresher.start()
+
+    print(
+        f"Serving health results on http://{address}:{port}/ "
+        f"(refresh every {refresh_seconds}s)",
+        file=sys.stderr
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stop.set()
+        refresher.join()
+    return 0
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -609,12 +954,18 @@ Examples:
   # Output as JSON
   %(prog)s --json
 
+  # Also scan every process (per-state counts, zombie detection)
+  %(prog)s --deep-proc-scan
+
   # Custom warning thresholds
   %(prog)s --warn-cpu 80 --warn-memory 85 --warn-disk 90
 
   # Custom critical thresholds
   %(prog)s --crit-cpu 95 --crit-memory 95 --crit-disk 98
 
+  # Keep running and serve cached JSON results at http://127.0.0.1:9100/
+  %(prog)s --serve 9100 --refresh-seconds 10
+
 Exit codes:
   0 - All checks passed (OK)
   1 - Warnings detected
@@ -627,6 +978,12 @@ Exit codes:
         action='store_true',
         help='Output results as JSON'
     )
+    parser.add_argument(
+        '--deep-proc-scan',
+        action='store_true',
+        help='Scan /proc/<pid>/stat for per-state process counts and zombies '
+             '(default: kernel task counters only)'
+    )
     parser.add_argument(
         '--warn-cpu',
         type=int,
@@ -663,9 +1020,32 @@ Exit codes:
         default=95,
         help='Disk usage critical threshold (default: 95%%)'
     )
+    parser.add_argument(
+        '--serve',
+        type=int,
+        metavar='PORT',
+        help='Run continuously and serve cached JSON results over HTTP on PORT '
+             '(HTTP 503 once results stop refreshing)'
+    )
+    parser.add_argument(
+        '--bind',
+        default='127.0.0.1',
+        metavar='ADDRESS',
+        help='Address to listen on with --serve (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--refresh-seconds',
+        type=float,
+        default=5,
+        metavar='N',
+        help='Seconds between background checks with --serve (default: 5)'
+    )
 
     args = parser.parse_args()
 
+    if args.refresh_seconds <= 0:
+        parser.error('--refresh-seconds must be positive')
+
     # Set up thresholds
     warning_thresholds = {
         'cpu': args.warn_cpu,
@@ -680,12 +1060,18 @@ Exit codes:
     }
 
     # Run health check
-    checker = SystemHealthChecker(warning_thresholds, critical_thresholds)
-    results = checker.check_health()
-
-    # Output results
+    with SystemHealthChecker(
+        warning_thresholds,
+        critical_thresholds,
+        scan_processes=args.deep_proc_scan
+    ) as checker:
+        if args.serve is not None:
+            return serve(checker, args.bind, args.serve, args.refresh_seconds)
+        results = checker.check_health()
+
+    # Output results (the plain-text report is only built when needed)
     if args.json:
-        print(json.dumps(results, indent=2))
+        print(format_json(results))
     else:
         print(format_plain_text(results))
 
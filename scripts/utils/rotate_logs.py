@@ -4,30 +4,118 @@ rotate-logs.py
 Purpose: Automate log rotation and compression with configurable retention
 Usage:   ./rotate-logs.py CONFIG_FILE
 Exit:    0 OK, 1 ERROR
-WARNING: DESTRUCTIVE — truncates live logs and deletes old rotations; use --dry-run first
+WARNING: DESTRUCTIVE — truncates (or renames) live logs and deletes old rotations; use --dry-run first
 
 Dependencies: None (uses Python standard library only)
+Optional:     zstandard (for codec "zstd"; falls back to gzip when missing)
+              orjson (faster parsing of large configuration files)
+              pigz / zstd binaries (multithreaded compression when on PATH)
 """
 
+import os
+import stat
 import sys
+import errno
 import json
+import time
 import gzip
 import shutil
 import argparse
+import fnmatch
+import subprocess
+import tempfile
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional, Union
 import re
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# I/O buffer size for reading rotated logs and writing compressed output
+COPY_BUFSIZE = 1 << 20
+
+# Maximum bytes per copy_file_range(2) call when duplicating a live log
+COPY_RANGE_CHUNK = 1 << 30
+
+# copy_file_range(2) errors that mean "not supported here", not a real failure
+COPY_RANGE_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+# Supported compression codecs: file suffix and default compression level
+CODEC_SUFFIXES = {'zstd': '.zst', 'gzip': '.gz'}
+CODEC_DEFAULT_LEVELS = {'zstd': 3, 'gzip': 6}
+# Accepted compression levels (inclusive); zstd 20-22 need --ultra on the CLI
+CODEC_LEVEL_RANGES = {'zstd': (1, 22), 'gzip': (0, 9)}
+
+# Remembers (mtime_ns, size) of each log right after it was rotated, so logs
+# that have not been written to since are skipped on the next run
+DEFAULT_STATE_FILE = Path.home() / '.cache' / 'rotate_logs' / 'state.json'
+
+# External multithreaded compressors preferred over in-process compression
+EXTERNAL_COMPRESSORS = {'zstd': 'zstd', 'gzip': 'pigz'}
+
+# Leading magic bytes of compressed formats, mapped to their file suffix.
+# Rotations that are already compressed (e.g. by the application) are only
+# renamed to the matching suffix instead of being compressed again.
+COMPRESSED_MAGIC = {
+    b'\x1f\x8b': '.gz',
+    b'\x28\xb5\x2f\xfd': '.zst',
+    b'BZh': '.bz2',
+    b'\xfd7zXZ\x00': '.xz',
+}
+ARCHIVE_SUFFIXES = tuple(COMPRESSED_MAGIC.values())
+
+# How the live log is rotated:
+#   copytruncate - copy to .1 and truncate in place (writers keep their FD)
+#   rename       - rename to .1 and recreate empty (writers must reopen, e.g. on SIGHUP)
+ROTATION_MODES = ('copytruncate', 'rename')
+
+# How rotated logs are named:
+#   shift     - app.log.1 is the newest; older rotations are renamed up by one
+#   timestamp - app.log.YYYYMMDD-HHMMSS; existing rotations are never renamed
+ROTATION_SCHEMES = ('shift', 'timestamp')
+TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
 
 
 class LogRotator:
     """Handle log file rotation and compression with configurable policies."""
 
-    def __init__(self, config: Dict, dry_run: bool = False, verbose: bool = False):
+    # Rotation number of a rotated log name, e.g. "app.log.3" or "app.log.3.gz"
+    _ROT_RE = re.compile(r'\.(\d+)(?:\.gz|\.zst|\.bz2|\.xz)?$')
+
+    # Timestamp of a rotated log name, e.g. "app.log.20240131-235959.gz"
+    _STAMP_RE = re.compile(r'\.(\d{8}-\d{6})(?:\.gz|\.zst|\.bz2|\.xz)?$')
+
+    # Hidden temporary archive left by an interrupted compression, e.g.
+    # ".app.log.1.zst.k3j9_x2a" (see _compress_one)
+    _TMP_RE = re.compile(r'(?:\.gz|\.zst)\.[a-z0-9_]{8}$')
+
+    def __init__(
+        self,
+        config: Dict,
+        dry_run: bool = False,
+        jobs: int = 1,
+        state_file: Optional[Path] = None
+    ):
         self.config = config
         self.dry_run = dry_run
-        self.verbose = verbose
+        self.jobs = max(1, jobs)
+        # Up to `jobs` compressions run at once; split the CPUs between them
+        self.compress_threads = max(1, (os.cpu_count() or 1) // self.jobs)
+        self.state_file = state_file
+        self._state = {}
         self.stats = {
             'rotated': 0,
             'compressed': 0,
@@ -35,15 +123,19 @@ class LogRotator:
             'errors': 0,
             'bytes_freed': 0
         }
+        self._stats_lock = threading.Lock()
+
+        # Log files are processed on a worker pool; compression is queued
+        # behind the rotations so live logs are rotated first
+        self._pool = ThreadPoolExecutor(max_workers=self.jobs)
+        self._pending = []
+        # Per-group cleanup work, run once all rotations and compressions are done
+        self._cleanups = []
 
-        # Setup logging
-        log_level = logging.DEBUG if verbose else logging.INFO
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s [%(levelname)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
         self.logger = logging.getLogger(__name__)
+        # Checked once so per-file debug messages cost nothing when disabled
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self._external = self._external_compressors()
 
     def rotate_logs(self) -> int:
         """
@@ -55,11 +147,26 @@ class LogRotator:
             return 1
 
         self.logger.info("Starting log rotation (dry_run=%s)", self.dry_run)
+        self._start_time = time.time()
+
+        self._state = self._load_state()
 
         for group_name, group_config in self.config['log_groups'].items():
             self.logger.info("Processing log group: %s", group_name)
             self._process_log_group(group_name, group_config)
 
+        # Wait for all queued work; running tasks may still queue follow-ups
+        while self._pending:
+            self._pending.pop().result()
+
+        # Clean up old rotations, listing each group's directory only once
+        for cleanup in self._cleanups:
+            self._cleanup_log_group(*cleanup)
+        self._cleanups.clear()
+
+        if not self.dry_run:
+            self._save_state()
+
         self._print_summary()
         return 0 if self.stats['errors'] == 0 else 1
 
@@ -70,230 +177,775 @@ class LogRotator:
         max_age_days = config.get('max_age_days', 30)
         max_rotations = config.get('max_rotations', 5)
         compress = config.get('compress', True)
+        codec = config.get('codec', 'zstd')
+        rotation_mode = config.get('rotation_mode', 'copytruncate')
+        rotation_scheme = config.get('rotation_scheme', 'shift')
         min_size_mb = config.get('min_size_mb', 0)
 
+        if rotation_mode not in ROTATION_MODES:
+            self.logger.error("Unknown rotation_mode for %s: %s", log_dir, rotation_mode)
+            self._add_stat('errors')
+            return
+
+        if rotation_scheme not in ROTATION_SCHEMES:
+            self.logger.error(
+                "Unknown rotation_scheme for %s: %s", log_dir, rotation_scheme
+            )
+            self._add_stat('errors')
+            return
+
+        if codec not in CODEC_SUFFIXES:
+            self.logger.error("Unknown codec for %s: %s", log_dir, codec)
+            self._add_stat('errors')
+            return
+
+        compress_level = config.get('compress_level', CODEC_DEFAULT_LEVELS[codec])
+        min_level, max_level = CODEC_LEVEL_RANGES[codec]
+        if (
+            not isinstance(compress_level, int)
+            or isinstance(compress_level, bool)
+            or not min_level <= compress_level <= max_level
+        ):
+            self.logger.error(
+                "Invalid compress_level for %s: %r (%s accepts %d-%d)",
+                log_dir, compress_level, codec, min_level, max_level
+            )
+            self._add_stat('errors')
+            return
+
+        if codec == 'zstd' and zstandard is None and 'zstd' not in self._external:
+            self.logger.debug("Neither zstandard module nor zstd binary found, using gzip")
+            codec = 'gzip'
+            # The configured level was chosen for zstd
+            compress_level = CODEC_DEFAULT_LEVELS['gzip']
+
         if not log_dir.exists():
             self.logger.warning("Directory does not exist: %s", log_dir)
             return
 
         if not log_dir.is_dir():
             self.logger.error("Not a directory: %s", log_dir)
-            self.stats['errors'] += 1
+            self._add_stat('errors')
             return
 
-        # Find matching log files
+        # List the directory once for both the log files and their rotations
         try:
-            log_files = self._find_log_files(log_dir, pattern)
+            entries = self._scan_directory(log_dir)
         except (OSError, PermissionError) as e:
             self.logger.error("Error finding log files in %s: %s", log_dir, e)
-            self.stats['errors'] += 1
+            self._add_stat('errors')
             return
 
+        log_files = self._find_log_files(log_dir, pattern, entries, rotation_mode)
         if not log_files:
             self.logger.debug("No log files found matching pattern: %s", pattern)
             return
 
         self.logger.info("Found %d log file(s)", len(log_files))
 
+        rotations = self._group_rotations(entries, [f.name for f in log_files])
+
+        # Workers add the logs they rotate, or skip as unchanged since their
+        # last rotation; only those have their old rotations cleaned up
+        cleanup_logs = []
+        self._cleanups.append(
+            (log_dir, cleanup_logs, max_age_days, max_rotations, rotation_scheme)
+        )
+
+        queue = self._pending.append
+        submit = self._pool.submit
         for log_file in log_files:
-            try:
-                self._process_log_file(
-                    log_file,
-                    max_age_days,
-                    max_rotations,
-                    compress,
-                    min_size_mb
-                )
-            except (OSError, PermissionError) as e:
-                self.logger.error("Error processing %s: %s", log_file, e)
-                self.stats['errors'] += 1
+            queue(submit(
+                self._run_guarded,
+                self._process_log_file,
+                log_file,
+                rotations[log_file.name],
+                cleanup_logs,
+                max_rotations,
+                rotation_mode,
+                rotation_scheme,
+                compress,
+                codec,
+                compress_level,
+                min_size_mb
+            ))
+
+    def _run_guarded(self, func, log_file: Path, *args) -> None:
+        """Run a per-file step, recording any error in the stats."""
+        try:
+            func(log_file, *args)
+        except (OSError, PermissionError) as e:
+            self.logger.error("Error processing %s: %s", log_file, e)
+            self._add_stat('errors')
+        except Exception:
+            # e.g. a compressor rejecting its options; one file must not abort
+            # the run and leave other logs rotated but uncompressed
+            self.logger.exception("Unexpected error processing %s", log_file)
+            self._add_stat('errors')
+
+    def _scan_directory(self, directory: Path) -> List[os.DirEntry]:
+        """List a directory once; entries cache their type and stat results."""
+        with os.scandir(directory) as entries:
+            return list(entries)
 
-    def _find_log_files(self, log_dir: Path, pattern: str) -> List[Path]:
+    def _find_log_files(
+        self,
+        log_dir: Path,
+        pattern: str,
+        entries: List[os.DirEntry],
+        rotation_mode: str
+    ) -> List[Path]:
         """Find log files matching the pattern."""
-        # Convert glob pattern to regex if needed
         if '*' in pattern or '?' in pattern:
-            return sorted(log_dir.glob(pattern))
+            matches = [
+                entry for entry in entries
+                if fnmatch.fnmatchcase(entry.name, pattern)
+            ]
         else:
             # Exact match
-            log_file = log_dir / pattern
-            return [log_file] if log_file.exists() else []
+            matches = [entry for entry in entries if entry.name == pattern]
+
+        # is_symlink() and is_file() use the entry's d_type, so most
+        # filesystems need no stat per entry
+        names = []
+        for entry in matches:
+            if entry.is_symlink() and rotation_mode == 'rename':
+                # Renaming would move the link and leave the target growing
+                self.logger.warning(
+                    "Skipping symlink in rename mode: %s", entry.path
+                )
+                self._add_stat('errors')
+            elif entry.is_file():
+                names.append(entry.name)
+        return [log_dir / name for name in sorted(names)]
+
+    def _group_rotations(
+        self,
+        entries: List[os.DirEntry],
+        log_names: List[str]
+    ) -> Dict[str, List[os.DirEntry]]:
+        """Group directory entries named "<log name>.*" by their log name."""
+        groups = {name: [] for name in log_names}
+        for entry in entries:
+            name = entry.name
+            dot = name.find('.')
+            while dot != -1:
+                group = groups.get(name[:dot])
+                if group is not None:
+                    group.append(entry)
+                dot = name.find('.', dot + 1)
+        return groups
 
     def _process_log_file(
         self,
         log_file: Path,
-        max_age_days: int,
+        rotations: List[os.DirEntry],
+        cleanup_logs: List[Path],
         max_rotations: int,
+        rotation_mode: str,
+        rotation_scheme: str,
         compress: bool,
+        codec: str,
+        compress_level: int,
         min_size_mb: float
     ) -> None:
         """Process a single log file."""
-        # Check if file should be rotated
-        if not self._should_rotate(log_file, min_size_mb):
+        try:
+            st = log_file.stat()
+        except FileNotFoundError:
+            return
+
+        # An idle log is not rotated again, but its old rotations still
+        # have to expire
+        if self._unchanged_since_rotation(log_file, st):
+            cleanup_logs.append(log_file)
+            return
+
+        # Check if file should be rotated; the stat result is reused below
+        if not self._should_rotate(log_file, st, min_size_mb):
             return
 
         self.logger.info("Rotating: %s", log_file)
 
-        # Rotate existing rotated logs (shift numbering)
-        self._shift_rotations(log_file, max_rotations)
+        if rotation_scheme == 'timestamp':
+            # Timestamped names are unique, so older rotations stay where they are
+            rotated_name = f"{log_file}.{datetime.now().strftime(TIMESTAMP_FORMAT)}"
+            if any(
+                Path(f"{rotated_name}{suffix}").exists()
+                for suffix in ('', *ARCHIVE_SUFFIXES)
+            ):
+                self.logger.warning("Already rotated this second, skipping: %s", log_file)
+                return
+        else:
+            # Rotate existing rotated logs (shift numbering)
+            self._shift_rotations(log_file, max_rotations, rotations)
+            rotated_name = f"{log_file}.1"
 
         # Rotate current log file
         if not self.dry_run:
-            rotated_name = f"{log_file}.1"
             try:
-                shutil.copy2(log_file, rotated_name)
-                # Truncate original log
-                with open(log_file, 'w', encoding='utf-8'):
-                    pass
+                if rotation_mode == 'rename':
+                    self._rename_and_recreate(log_file, rotated_name, st)
+                    # Persist the shifted rotations and the rename in one go
+                    self._fsync_path(log_file.parent)
+                else:
+                    self._fast_copy(log_file, rotated_name)
+                    # Persist the shifted rotations and the copy before the
+                    # original is truncated, so a crash cannot lose log data
+                    self._fsync_path(log_file.parent)
+                    # Truncate original log
+                    with open(log_file, 'w', encoding='utf-8'):
+                        pass
                 self.logger.info("Created: %s", rotated_name)
-                self.stats['rotated'] += 1
+                self._add_stat('rotated')
+                self._remember_rotated(log_file)
             except (OSError, PermissionError) as e:
                 self.logger.error("Failed to rotate %s: %s", log_file, e)
-                self.stats['errors'] += 1
+                self._add_stat('errors')
                 return
         else:
-            self.logger.info("[DRY RUN] Would rotate: %s -> %s.1", log_file, log_file)
-            self.stats['rotated'] += 1
+            self.logger.info("[DRY RUN] Would rotate: %s -> %s", log_file, rotated_name)
+            self._add_stat('rotated')
+
+        cleanup_logs.append(log_file)
 
-        # Compress rotated logs if enabled
+        # Compress in the background so that large files do not hold up
+        # rotation of the remaining logs
         if compress:
-            self._compress_rotated_logs(log_file, max_rotations)
+            # After a rename the application keeps writing to the rotated
+            # file until it reopens its log, so leave the newest rotation
+            # uncompressed until the next run (like logrotate's delaycompress)
+            delay_name = Path(rotated_name).name if rotation_mode == 'rename' else None
+            self._pending.append(self._pool.submit(
+                self._run_guarded,
+                self._compress_rotated_logs,
+                log_file,
+                max_rotations,
+                rotation_scheme,
+                codec,
+                compress_level,
+                delay_name
+            ))
 
-        # Clean up old rotated logs
-        self._cleanup_old_rotations(log_file, max_age_days, max_rotations)
+    def _fast_copy(self, src: Path, dst: str) -> None:
+        """
+        Copy a file with its metadata, like shutil.copy2, keeping the data in
+        the kernel via copy_file_range(2) when the platform supports it.
+        Falls back to shutil.copy2, which itself uses sendfile(2) on Linux.
+        """
+        if hasattr(os, 'copy_file_range'):
+            try:
+                with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+                    in_fd, out_fd = f_in.fileno(), f_out.fileno()
+                    while os.copy_file_range(in_fd, out_fd, COPY_RANGE_CHUNK):
+                        pass
+                    os.fsync(out_fd)
+                shutil.copystat(src, dst)
+                return
+            except OSError as e:
+                if e.errno not in COPY_RANGE_FALLBACK_ERRNOS:
+                    raise
+                self.logger.debug("copy_file_range unavailable for %s: %s", src, e)
 
-    def _should_rotate(self, log_file: Path, min_size_mb: float) -> bool:
-        """Determine if a log file should be rotated."""
-        if not log_file.exists():
+        shutil.copy2(src, dst)
+        self._fsync_path(dst)
+
+    def _fsync_path(self, path: Union[Path, str]) -> None:
+        """Flush a file, or a directory's entries, to disk."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _rename_and_recreate(
+        self,
+        log_file: Path,
+        rotated_name: str,
+        st: os.stat_result
+    ) -> None:
+        """Rename the live log aside and create an empty one in its place."""
+        os.rename(log_file, rotated_name)
+
+        with open(log_file, 'a', encoding='utf-8'):
+            pass
+
+        # Keep the original permissions and, where allowed, ownership
+        os.chmod(log_file, st.st_mode & 0o7777)
+        try:
+            os.chown(log_file, st.st_uid, st.st_gid)
+        except PermissionError:
+            self.logger.debug("Could not restore ownership of %s", log_file)
+
+    def _unchanged_since_rotation(self, log_file: Path, st: os.stat_result) -> bool:
+        """Check the state file for a log that has not changed since we rotated it."""
+        if self._state.get(str(log_file)) != [st.st_mtime_ns, st.st_size]:
             return False
+        if self._debug_enabled:
+            self.logger.debug("Skipping %s: unchanged since last rotation", log_file.name)
+        return True
 
+    def _should_rotate(
+        self,
+        log_file: Path,
+        st: os.stat_result,
+        min_size_mb: float
+    ) -> bool:
+        """Determine if a log file should be rotated."""
         # Check minimum size requirement
         if min_size_mb > 0:
-            size_mb = log_file.stat().st_size / (1024 * 1024)
+            size_mb = st.st_size / (1024 * 1024)
             if size_mb < min_size_mb:
-                self.logger.debug(
-                    "Skipping %s: size %.2fMB < %.2fMB",
-                    log_file.name, size_mb, min_size_mb
-                )
+                if self._debug_enabled:
+                    self.logger.debug(
+                        "Skipping %s: size %.2fMB < %.2fMB",
+                        log_file.name, size_mb, min_size_mb
+                    )
                 return False
 
         return True
 
-    def _shift_rotations(self, log_file: Path, max_rotations: int) -> None:
+    def _shift_rotations(
+        self,
+        log_file: Path,
+        max_rotations: int,
+        rotations: List[os.DirEntry]
+    ) -> None:
         """Shift existing rotation numbers (e.g., .2 -> .3, .1 -> .2)."""
-        # Start from highest number and work backwards
-        for i in range(max_rotations - 1, 0, -1):
-            old_name = Path(f"{log_file}.{i}")
-            new_name = Path(f"{log_file}.{i + 1}")
+        # Key the existing rotations by rotation number (compressed versions
+        # of any format included)
+        prefix_len = len(log_file.name) + 1
+        present = {}
+        for entry in rotations:
+            num, dot, ext = entry.name[prefix_len:].partition('.')
+            if num.isdigit() and (not dot or f".{ext}" in ARCHIVE_SUFFIXES):
+                present.setdefault(int(num), []).append(f"{dot}{ext}")
 
-            # Also check for compressed versions
-            old_gz = Path(f"{old_name}.gz")
-            new_gz = Path(f"{new_name}.gz")
+        # Start from highest number and work backwards
+        for i in sorted((n for n in present if 0 < n < max_rotations), reverse=True):
+            for suffix in present[i]:
+                old_path = Path(f"{log_file}.{i}{suffix}")
+                new_path = Path(f"{log_file}.{i + 1}{suffix}")
 
-            if old_gz.exists():
-                if not self.dry_run:
-                    old_gz.rename(new_gz)
-                    self.logger.debug("Renamed: %s -> %s", old_gz.name, new_gz.name)
-                else:
-                    self.logger.debug(
-                        "[DRY RUN] Would rename: %s -> %s", old_gz.name, new_gz.name
-                    )
-            elif old_name.exists():
                 if not self.dry_run:
-                    old_name.rename(new_name)
-                    self.logger.debug("Renamed: %s -> %s", old_name.name, new_name.name)
-                else:
+                    old_path.rename(new_path)
+                    if self._debug_enabled:
+                        self.logger.debug(
+                            "Renamed: %s -> %s", old_path.name, new_path.name
+                        )
+                elif self._debug_enabled:
                     self.logger.debug(
-                        "[DRY RUN] Would rename: %s -> %s", old_name.name, new_name.name
+                        "[DRY RUN] Would rename: %s -> %s", old_path.name, new_path.name
                     )
 
-    def _compress_rotated_logs(self, log_file: Path, max_rotations: int) -> None:
-        """Compress rotated log files."""
-        for i in range(1, max_rotations + 1):
-            rotated_file = Path(f"{log_file}.{i}")
-            compressed_file = Path(f"{rotated_file}.gz")
+    def _compress_rotated_logs(
+        self,
+        log_file: Path,
+        max_rotations: int,
+        rotation_scheme: str,
+        codec: str,
+        compress_level: int,
+        delay_name: Optional[str] = None
+    ) -> None:
+        """Compress rotated log files, except the one named delay_name."""
+        # One listing answers both "does this rotation exist" and "is it
+        # already archived" for every slot, instead of a stat per suffix
+        prefix = f"{log_file.name}."
+        with os.scandir(log_file.parent) as entries:
+            names = {entry.name for entry in entries if entry.name.startswith(prefix)}
 
-            if rotated_file.exists() and not compressed_file.exists():
-                if not self.dry_run:
-                    try:
-                        with open(rotated_file, 'rb') as f_in:
-                            with gzip.open(compressed_file, 'wb') as f_out:
-                                shutil.copyfileobj(f_in, f_out)
-
-                        # Calculate space saved
-                        original_size = rotated_file.stat().st_size
-                        compressed_size = compressed_file.stat().st_size
-                        saved = original_size - compressed_size
-                        self.stats['bytes_freed'] += saved
-
-                        # Remove original
-                        rotated_file.unlink()
-
-                        self.logger.info(
-                            "Compressed: %s (%s -> %s)",
-                            rotated_file.name,
-                            self._format_bytes(original_size),
-                            self._format_bytes(compressed_size)
-                        )
-                        self.stats['compressed'] += 1
-                    except (OSError, PermissionError) as e:
-                        self.logger.error("Failed to compress %s: %s", rotated_file, e)
-                        self.stats['errors'] += 1
+        if rotation_scheme == 'timestamp':
+            candidates = sorted(
+                name for name in names
+                if self._STAMP_RE.search(name) and not name.endswith(ARCHIVE_SUFFIXES)
+            )
+        else:
+            candidates = [
+                f"{prefix}{i}" for i in range(1, max_rotations + 1)
+                if f"{prefix}{i}" in names
+            ]
+
+        compressed_any = False
+        for name in candidates:
+            if name == delay_name:
+                if self._debug_enabled:
+                    self.logger.debug("Delaying compression of %s to the next run", name)
+                continue
+            if any(f"{name}{suffix}" in names for suffix in ARCHIVE_SUFFIXES):
+                continue
+
+            rotated_file = log_file.parent / name
+            compressed_file = Path(f"{rotated_file}{CODEC_SUFFIXES[codec]}")
+            if self._compress_one(rotated_file, compressed_file, codec, compress_level):
+                compressed_any = True
+
+        # Persist the new archives and removed originals with one directory sync
+        if compressed_any and not self.dry_run:
+            self._fsync_path(log_file.parent)
+
+    def _compress_one(
+        self,
+        rotated_file: Path,
+        compressed_file: Path,
+        codec: str,
+        compress_level: int
+    ) -> bool:
+        """
+        Compress a single rotated log file and remove the original.
+        Returns: True if the rotated file was replaced by an archive
+        """
+        if self.dry_run:
+            self.logger.info("[DRY RUN] Would compress: %s", rotated_file.name)
+            self._add_stat('compressed')
+            return True
+
+        try:
+            archive_suffix = self._detect_compressed(rotated_file)
+            if archive_suffix:
+                archive = Path(f"{rotated_file}{archive_suffix}")
+                os.rename(rotated_file, archive)
+                self.logger.info(
+                    "Already compressed, skipping: %s -> %s",
+                    rotated_file.name, archive.name
+                )
+                return True
+
+            # Write to a hidden temporary file and move it into place when
+            # complete, so an interrupted run never leaves a partial archive
+            # under the final name
+            fd, tmp_name = tempfile.mkstemp(
+                dir=rotated_file.parent, prefix=f".{compressed_file.name}."
+            )
+            os.close(fd)
+            tmp_file = Path(tmp_name)
+            try:
+                if codec in self._external:
+                    original_size = self._compress_external(
+                        rotated_file, tmp_file, codec, compress_level
+                    )
                 else:
+                    with open(rotated_file, 'rb', buffering=0) as f_in, \
+                            self._open_compressor(
+                                tmp_file, codec, compress_level, rotated_file.name
+                            ) as f_out:
+                        original_size = self._copy_stream(f_in, f_out)
+                        self._drop_cache(f_in.fileno())
+
+                # mkstemp creates the file 0600; give the archive the log's mode
+                shutil.copymode(rotated_file, tmp_file)
+                os.replace(tmp_file, compressed_file)
+            except BaseException:
+                tmp_file.unlink(missing_ok=True)
+                raise
+
+            # Calculate space saved
+            compressed_size = compressed_file.stat().st_size
+            saved = original_size - compressed_size
+            self._add_stat('bytes_freed', saved)
+
+            # Remove original
+            rotated_file.unlink()
+
+            self.logger.info(
+                "Compressed: %s (%s -> %s)",
+                rotated_file.name,
+                self._format_bytes(original_size),
+                self._format_bytes(compressed_size)
+            )
+            self._add_stat('compressed')
+            return True
+        except (OSError, PermissionError) as e:
+            self.logger.error("Failed to compress %s: %s", rotated_file, e)
+            self._add_stat('errors')
+            return False
+
+    def _external_compressors(self) -> Dict[str, str]:
+        """Find external compressor binaries on PATH, keyed by codec."""
+        found = {}
+        for codec, binary in EXTERNAL_COMPRESSORS.items():
+            path = shutil.which(binary)
+            if path:
+                found[codec] = path
+                self.logger.debug("Using %s for %s compression", path, codec)
+        return found
+
+    def _compress_external(
+        self,
+        rotated_file: Path,
+        compressed_file: Path,
+        codec: str,
+        compress_level: int
+    ) -> int:
+        """
+        Compress a file with an external multithreaded compressor.
+        Returns: Size of the original file in bytes
+        """
+        binary = self._external[codec]
+        if codec == 'zstd':
+            cmd = [
+                binary, '-q', f'-T{self.compress_threads}', '--long',
+                f'-{compress_level}', '-c'
+            ]
+            if compress_level > 19:
+                cmd.insert(1, '--ultra')
+        else:
+            cmd = [binary, '-p', str(self.compress_threads), f'-{compress_level}', '-c']
+
+        with open(rotated_file, 'rb') as f_in, open(compressed_file, 'wb') as f_out:
+            result = subprocess.run(
+                cmd,
+                stdin=f_in,
+                stdout=f_out,
+                stderr=subprocess.PIPE,
+                check=False
+            )
+            if result.returncode != 0:
+                raise OSError(
+                    f"{binary} exited with status {result.returncode}: "
+                    f"{result.stderr.decode(errors='replace').strip()}"
+                )
+
+            # Make sure the archive is on disk before the original is removed
+            os.fsync(f_out.fileno())
+            self._drop_cache(f_out.fileno())
+            self._drop_cache(f_in.fileno())
+            return os.fstat(f_in.fileno()).st_size
+
+    def _drop_cache(self, fd: int) -> None:
+        """
+        Evict a file's pages from the page cache once we are done with it, so
+        compressing large logs does not push out other processes' hot data.
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError as e:
+            if self._debug_enabled:
+                self.logger.debug("posix_fadvise failed: %s", e)
+
+    def _copy_stream(self, f_in, f_out) -> int:
+        """
+        Copy f_in to f_out through one preallocated buffer.
+        Returns: Number of bytes copied
+        """
+        buf = bytearray(COPY_BUFSIZE)
+        view = memoryview(buf)
+        copied = 0
+        while True:
+            n = f_in.readinto(buf)
+            if not n:
+                break
+            f_out.write(view[:n])
+            copied += n
+        return copied
+
+    def _detect_compressed(self, path: Path) -> str:
+        """Return the archive suffix if the file starts with a known magic, else ''."""
+        with open(path, 'rb') as f:
+            head = f.read(6)
+        for magic, suffix in COMPRESSED_MAGIC.items():
+            if head.startswith(magic):
+                return suffix
+        return ''
+
+    @contextmanager
+    def _open_compressor(self, path: Path, codec: str, level: int, name: str):
+        """
+        Open a streaming compressed writer for the given codec.
+        name is recorded in the gzip header instead of the temporary path.
+        """
+        with open(path, 'wb', buffering=COPY_BUFSIZE) as raw_out:
+            if codec == 'zstd':
+                # threads=0 compresses on the calling thread
+                threads = self.compress_threads if self.compress_threads > 1 else 0
+                compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+                with compressor.stream_writer(raw_out, closefd=False) as f_out:
+                    yield f_out
+            else:
+                with gzip.GzipFile(
+                    filename=name,
+                    fileobj=raw_out,
+                    mode='wb',
+                    compresslevel=level
+                ) as f_out:
+                    yield f_out
+
+            # Make sure the archive is on disk before the original is removed
+            raw_out.flush()
+            os.fsync(raw_out.fileno())
+            self._drop_cache(raw_out.fileno())
+
+    def _cleanup_log_group(
+        self,
+        log_dir: Path,
+        cleanup_logs: List[Path],
+        max_age_days: int,
+        max_rotations: int,
+        rotation_scheme: str
+    ) -> None:
+        """Remove old rotations of a group's logs using one directory listing."""
+        if not cleanup_logs:
+            return
+
+        try:
+            entries = self._scan_directory(log_dir)
+        except (OSError, PermissionError) as e:
+            self.logger.error("Error listing %s for cleanup: %s", log_dir, e)
+            self._add_stat('errors')
+            return
+
+        self._remove_stale_temp_files(entries, cleanup_logs)
+
+        rotations = self._group_rotations(entries, [f.name for f in cleanup_logs])
+        for log_file in cleanup_logs:
+            self._run_guarded(
+                self._cleanup_old_rotations,
+                log_file,
+                rotations[log_file.name],
+                max_age_days,
+                max_rotations,
+                rotation_scheme
+            )
+
+    def _remove_stale_temp_files(
+        self,
+        entries: List[os.DirEntry],
+        log_files: List[Path]
+    ) -> None:
+        """
+        Remove temporary archives left behind by a killed or crashed run.
+        Only files older than this run are touched, since an overlapping
+        run may still be writing its own, and only ones that are empty or
+        hold compressed data, so a decompressed copy is never removed.
+        """
+        prefixes = tuple(f".{f.name}." for f in log_files)
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith(prefixes) and self._TMP_RE.search(name)):
+                continue
+
+            try:
+                st = entry.stat(follow_symlinks=False)
+                if not stat.S_ISREG(st.st_mode) or st.st_mtime >= self._start_time:
+                    continue
+                if st.st_size and not self._detect_compressed(Path(entry.path)):
+                    continue
+
+                if self.dry_run:
                     self.logger.info(
-                        "[DRY RUN] Would compress: %s", rotated_file.name
+                        "[DRY RUN] Would remove stale temporary file: %s", name
                     )
-                    self.stats['compressed'] += 1
+                    continue
+                os.unlink(entry.path)
+                self.logger.info("Removed stale temporary file: %s", name)
+            except FileNotFoundError:
+                pass
+            except (OSError, PermissionError) as e:
+                self.logger.error("Failed to remove %s: %s", entry.path, e)
+                self._add_stat('errors')
 
     def _cleanup_old_rotations(
         self,
         log_file: Path,
+        rotations: List[os.DirEntry],
         max_age_days: int,
-        max_rotations: int
+        max_rotations: int,
+        rotation_scheme: str
     ) -> None:
         """Remove old rotated log files based on age and count."""
-        cutoff_date = datetime.now() - timedelta(days=max_age_days)
+        cutoff_ts = time.time() - max_age_days * 86400
 
-        # Find all rotated versions
-        pattern = f"{log_file.name}.*"
-        rotated_files = sorted(
-            log_file.parent.glob(pattern),
-            key=lambda p: p.stat().st_mtime
-        )
+        # Stat each rotated version only once
+        rotated_files = []
+        for entry in rotations:
+            st = entry.stat()
+            rotated_files.append((Path(entry.path), st.st_mtime, st.st_size))
+        rotated_files.sort(key=lambda item: item[1])
 
-        for rotated in rotated_files:
-            # Skip if it's the main log file
-            if rotated == log_file:
-                continue
+        # Timestamped rotations beyond the newest max_rotations are excess
+        excess = set()
+        if rotation_scheme == 'timestamp':
+            stamped = []
+            for rotated, _, _ in rotated_files:
+                match = self._STAMP_RE.search(rotated.name)
+                if match:
+                    stamped.append((match.group(1), rotated))
+            stamped.sort(reverse=True)
+            excess = {rotated for _, rotated in stamped[max_rotations:]}
+
+        log_info = self.logger.info
+        log_error = self.logger.error
+        rot_search = self._ROT_RE.search
 
+        for rotated, st_mtime, size in rotated_files:
             # Check age
-            mtime = datetime.fromtimestamp(rotated.stat().st_mtime)
-            too_old = mtime < cutoff_date
+            too_old = st_mtime < cutoff_ts
 
             # Check rotation count
-            match = re.search(r'\.(\d+)(\.gz)?$', rotated.name)
-            if match:
-                rotation_num = int(match.group(1))
-                too_many = rotation_num > max_rotations
+            if rotation_scheme == 'timestamp':
+                too_many = rotated in excess
             else:
-                too_many = False
+                match = rot_search(rotated.name)
+                if match:
+                    rotation_num = int(match.group(1))
+                    too_many = rotation_num > max_rotations
+                else:
+                    too_many = False
 
             if too_old or too_many:
-                size = rotated.stat().st_size
                 if not self.dry_run:
                     try:
                         rotated.unlink()
-                        self.logger.info("Deleted old rotation: %s", rotated.name)
-                        self.stats['deleted'] += 1
-                        self.stats['bytes_freed'] += size
+                        log_info("Deleted old rotation: %s", rotated.name)
+                        self._add_stat('deleted')
+                        self._add_stat('bytes_freed', size)
                     except (OSError, PermissionError) as e:
-                        self.logger.error("Failed to delete %s: %s", rotated, e)
-                        self.stats['errors'] += 1
+                        log_error("Failed to delete %s: %s", rotated, e)
+                        self._add_stat('errors')
                 else:
                     reason = "too old" if too_old else "exceeds max rotations"
-                    self.logger.info(
-                        "[DRY RUN] Would delete %s (%s)", rotated.name, reason
-                    )
-                    self.stats['deleted'] += 1
+                    log_info("[DRY RUN] Would delete %s (%s)", rotated.name, reason)
+                    self._add_stat('deleted')
+
+    def _load_state(self) -> Dict[str, List[int]]:
+        """Load the per-log state saved by the previous run."""
+        if self.state_file is None:
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable state file %s: %s", self.state_file, e)
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _remember_rotated(self, log_file: Path) -> None:
+        """Record the freshly emptied log so an idle log is not rotated again."""
+        if self.state_file is None:
+            return
+        st = log_file.stat()
+        self._state[str(log_file)] = [st.st_mtime_ns, st.st_size]
+
+    def _save_state(self) -> None:
+        """Write the per-log state atomically for the next run."""
+        if self.state_file is None:
+            return
+        tmp_file = Path(f"{self.state_file}.tmp")
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            self.logger.warning("Could not save state file %s: %s", self.state_file, e)
+
+    def _add_stat(self, key: str, value: int = 1) -> None:
+        """Increment a summary counter (safe to call from worker threads)."""
+        with self._stats_lock:
+            self.stats[key] += value
 
     def _format_bytes(self, bytes_size: int) -> str:
         """Format bytes into human-readable string."""
@@ -318,6 +970,8 @@ class LogRotator:
 def load_config(config_file: str) -> Dict:
     """Load configuration from JSON file."""
     try:
+        if orjson is not None:
+            return orjson.loads(Path(config_file).read_bytes())
         with open(config_file, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
@@ -337,7 +991,11 @@ def print_example_config() -> None:
                 "pattern": "access.log",
                 "max_age_days": 30,
                 "max_rotations": 7,
+                "rotation_mode": "copytruncate",
+                "rotation_scheme": "shift",
                 "compress": True,
+                "codec": "zstd",
+                "compress_level": 3,
                 "min_size_mb": 10
             },
             "application_logs": {
@@ -379,16 +1037,34 @@ Examples:
   # Verbose output
   %(prog)s /etc/logrotate.json --verbose
 
+  # Process at most 2 log files in parallel
+  %(prog)s /etc/logrotate.json --jobs 2
+
   # Show example configuration
   %(prog)s --example-config
 
 Configuration format:
   JSON file with log_groups defining:
   - directory: Path to log directory
-  - pattern: Filename pattern (supports * and ?)
+  - pattern: Filename pattern (supports * and ?); symlinked logs are
+    rotated through the link in copytruncate mode but skipped in rename
+    mode, so point directory at the real log location there
   - max_age_days: Delete rotations older than this (default: 30)
   - max_rotations: Maximum number of rotations to keep (default: 5)
-  - compress: Whether to gzip rotated logs (default: true)
+  - rotation_mode: "copytruncate" copies then truncates the live log, so
+    writers holding it open are unaffected; "rename" moves it aside and
+    recreates it, which avoids copying but requires the application to
+    reopen its log (e.g. on SIGHUP) (default: copytruncate). With "rename"
+    the newest rotation is compressed on the following run, not right away,
+    so lines written before the application reopens its log are kept
+  - rotation_scheme: "shift" names rotations .1, .2, ... and renames older
+    ones on every rotation; "timestamp" names them .YYYYMMDD-HHMMSS and
+    never renames them, which keeps rotation cheap for large max_rotations
+    (default: shift)
+  - compress: Whether to compress rotated logs (default: true)
+  - codec: "zstd" or "gzip" (default: zstd, gzip if zstandard is missing)
+  - compress_level: Codec compression level, 1-22 for zstd and 0-9 for gzip
+    (default: 3 for zstd, 6 for gzip)
   - min_size_mb: Minimum file size in MB to trigger rotation (default: 0)
         """
     )
@@ -408,6 +1084,24 @@ Configuration format:
         action='store_true',
         help='Enable verbose output'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help='Number of log files to process in parallel (default: CPUs, max 8)'
+    )
+    parser.add_argument(
+        '--state-file',
+        type=Path,
+        default=DEFAULT_STATE_FILE,
+        help='File recording logs left unchanged since their last rotation '
+             f'(default: {DEFAULT_STATE_FILE})'
+    )
+    parser.add_argument(
+        '--no-state',
+        action='store_true',
+        help='Do not read or write the state file'
+    )
     parser.add_argument(
         '--example-config',
         action='store_true',
@@ -425,11 +1119,24 @@ Configuration format:
     if not args.config_file:
         parser.error("config_file is required")
 
+    # Setup logging
+    log_level = logging.DEBUG if args.verbose else logging.INFO
+    logging.basicConfig(
+        level=log_level,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
     # Load configuration
     config = load_config(args.config_file)
 
     # Create rotator and execute
-    rotator = LogRotator(config, dry_run=args.dry_run, verbose=args.verbose)
+    rotator = LogRotator(
+        config,
+        dry_run=args.dry_run,
+        jobs=args.jobs,
+        state_file=None if args.no_state else args.state_file
+    )
     return rotator.rotate_logs()
 
 